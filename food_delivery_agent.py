@@ -1,46 +1,80 @@
+from __future__ import annotations
+
 import asyncio
+import functools
+import hashlib
 import json
 import logging
+import os
+import pickle
+import random
+import re
+import stat
 import time
 import uuid
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass, asdict, field
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime
 from enum import Enum
-import argparse
+from types import SimpleNamespace
 import sys
+import threading
 
-from playwright.async_api import (
-    async_playwright,
-    BrowserContext,
-    Page,
-    TimeoutError as PlaywrightTimeoutError,
-    Error as PlaywrightError,
-)
+# Playwright is imported by _import_playwright(): when run as a script that happens
+# after argument parsing, so --help and argument errors don't pay for the import
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Locator, Page
 
+# rich submodules are imported where they are used (setup_logging / print_report)
 try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-    from rich.logging import RichHandler
+    import rich  # noqa: F401
     RICH_AVAILABLE = True
 except ImportError:
     RICH_AVAILABLE = False
     print("Install 'rich' for better output: pip install rich")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # ==================== Configuration ====================
 
 class Config:
     """Application configuration"""
-    DEFAULT_TIMEOUT = 15000  # ms
+    DEFAULT_TIMEOUT = 5000  # ms
     NAVIGATION_TIMEOUT = 30000  # ms
+    CART_RESPONSE_TIMEOUT = 3000  # ms to wait for the cart update after an add click
     RETRY_ATTEMPTS = 3
     RETRY_BACKOFF = 2.0
-    PAGE_LOAD_WAIT = 2  # seconds
-    ACTION_DELAY = 1  # seconds between actions
+    RETRY_MAX_WAIT = 10.0  # seconds, cap for a single backoff
     MIN_RATING = 3.8
     MAX_RESULTS_PER_PLATFORM = 5
+    MAX_CONCURRENT_SEARCHES = 4  # food items searched in parallel per platform
+    USE_NETWORK_IDLE = False  # cart pages: wait for networkidle instead of the next element (slow on ad-heavy pages)
+
+    # On-disk search result cache
+    # user-private (0700): the entries are pickles, so never a directory that ships with a checkout
+    CACHE_DIR = "~/.cache/food_agent"
+    SEARCH_CACHE_TTL = 300  # seconds, 0 disables the search cache
+
+    # Config file
+    CONFIG_READ_BUFFER = 128 * 1024  # bytes
+    CONFIG_STREAM_THRESHOLD = 1024 * 1024  # bytes; larger files are stream-parsed when ijson is installed
 
     # Logging
     LOG_LEVEL = logging.INFO
@@ -48,51 +82,66 @@ class Config:
     LOG_FILE = "food_delivery_agent.log"
 
     # Browser settings (persistent profile)
-    HEADLESS = False
-    SLOW_MO = 100  # ms
+    HEADLESS = True
+    SLOW_MO = 0  # ms
     VIEWPORT = {"width": 1920, "height": 1080}
     USER_DATA_DIR = "./browser_data"  # persistent profile dir
+    # --daemon keeps this browser running between runs; later runs attach over CDP
+    # on the port Chromium picks, which is recorded in this file (mode 0600)
+    DAEMON_STATE_FILE = "~/.food_agent/daemon.json"
+    # Requests aborted for every page; the extractors only read DOM text
+    BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+    BLOCKED_URL_MARKERS = ("googletagmanager", "google-analytics", "doubleclick", "segment.io", "branch.io")
 
 # ==================== Logging Setup ====================
 
-def setup_logging(log_file: Optional[str] = None, verbose: bool = False):
-    """Configure logging with file and console handlers"""
+def setup_logging(verbose: bool = False):
+    """Configure console logging (the log file is attached later, see add_file_logging)"""
     log_level = logging.DEBUG if verbose else Config.LOG_LEVEL
 
-    handlers = []
-
-    # File handler
-    if log_file:
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setFormatter(logging.Formatter(Config.LOG_FORMAT))
-        handlers.append(file_handler)
-
     # Console handler
     if RICH_AVAILABLE:
+        from rich.logging import RichHandler
         console_handler = RichHandler(rich_tracebacks=True)
-        handlers.append(console_handler)
     else:
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(logging.Formatter(Config.LOG_FORMAT))
-        handlers.append(console_handler)
 
     logging.basicConfig(
         level=log_level,
         format=Config.LOG_FORMAT,
-        handlers=handlers
+        handlers=[console_handler]
     )
 
+def add_file_logging(log_file: Optional[str]):
+    """Attach the file handler once a real run is about to start.
+
+    Runs that stop at argument or config errors never create the log file.
+    """
+    if not log_file:
+        return
+    root = logging.getLogger()
+    path = os.path.abspath(log_file)
+    if any(isinstance(h, logging.FileHandler) and h.baseFilename == path for h in root.handlers):
+        return
+    file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+    file_handler.setFormatter(logging.Formatter(Config.LOG_FORMAT))
+    root.addHandler(file_handler)
+
 logger = logging.getLogger("FoodDeliveryAgent")
 
 # ==================== Data Models ====================
 
+# __slots__ dataclasses (no per-instance __dict__) where supported (Python 3.10+)
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 class Platform(Enum):
     SWIGGY = "Swiggy"
     ZOMATO = "Zomato"
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class SearchRequest:
-    """User's search criteria"""
+    """User's search criteria (immutable once built)"""
     food_items: List[str]
     min_rating: float = Config.MIN_RATING
     price_min: Optional[float] = None
@@ -101,11 +150,22 @@ class SearchRequest:
     location: Optional[str] = None
 
     def __post_init__(self):
-        self.food_items = [item.strip() for item in self.food_items if item.strip()]
+        object.__setattr__(self, 'food_items', list(filter(None, map(str.strip, self.food_items))))
         if not self.food_items:
             raise ValueError("At least one food item is required")
 
-@dataclass
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain dict of the fields (shallow; no deepcopy like dataclasses.asdict)"""
+        return {
+            "food_items": list(self.food_items),
+            "min_rating": self.min_rating,
+            "price_min": self.price_min,
+            "price_max": self.price_max,
+            "max_results_per_platform": self.max_results_per_platform,
+            "location": self.location
+        }
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ItemResult:
     """Result for a single food item"""
     restaurant_name: str
@@ -117,7 +177,7 @@ class ItemResult:
     coupon_applied: Optional[str]
     platform: str
     url: Optional[str] = None
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: float = field(default_factory=time.time)  # epoch seconds; see timestamp_iso
 
     def calculate_discount(self):
         """Calculate discount percentage"""
@@ -126,7 +186,27 @@ class ItemResult:
                 ((self.item_price - self.final_price) / self.item_price) * 100, 2
             )
 
-@dataclass
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain dict of the fields (all primitives, so no copying is needed)"""
+        return {
+            "restaurant_name": self.restaurant_name,
+            "rating": self.rating,
+            "item_name": self.item_name,
+            "item_price": self.item_price,
+            "final_price": self.final_price,
+            "discount_percentage": self.discount_percentage,
+            "coupon_applied": self.coupon_applied,
+            "platform": self.platform,
+            "url": self.url,
+            "timestamp": self.timestamp_iso
+        }
+
+    @property
+    def timestamp_iso(self) -> str:
+        """Local-time ISO 8601 timestamp, formatted only when the report is written"""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
+@dataclass(**_DATACLASS_OPTIONS)
 class PlatformReport:
     """Report for a single platform"""
     platform: str
@@ -137,7 +217,19 @@ class PlatformReport:
     available: bool = True
     latency_ms: Optional[float] = None
 
-@dataclass
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain dict of the fields, one level deep (results stay ItemResult objects)"""
+        return {
+            "platform": self.platform,
+            "items_found": self.items_found,
+            "successful_additions": self.successful_additions,
+            "errors": list(self.errors),
+            "results": self.results,
+            "available": self.available,
+            "latency_ms": self.latency_ms
+        }
+
+@dataclass(**_DATACLASS_OPTIONS)
 class RunReport:
     """Complete execution report"""
     search_request: SearchRequest
@@ -146,44 +238,89 @@ class RunReport:
     best_deal: Optional[ItemResult]
     platform_reports: List[PlatformReport]
     execution_time_seconds: float
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: float = field(default_factory=time.time)  # epoch seconds; see timestamp_iso
 
     def to_dict(self) -> Dict[str, Any]:
+        """Fully expanded nested dict"""
         return {
-            "search_request": asdict(self.search_request),
+            "search_request": self.search_request.as_dict(),
             "platforms_processed": self.platforms_processed,
             "total_options": self.total_options,
-            "best_deal": asdict(self.best_deal) if self.best_deal else None,
+            "best_deal": self.best_deal.as_dict() if self.best_deal else None,
             "platform_reports": [
-                {
-                    "platform": pr.platform,
-                    "items_found": pr.items_found,
-                    "successful_additions": pr.successful_additions,
-                    "errors": pr.errors,
-                    "results": [asdict(r) for r in pr.results],
-                    "available": pr.available,
-                    "latency_ms": pr.latency_ms
-                }
+                {**pr.as_dict(), "results": [r.as_dict() for r in pr.results]}
                 for pr in self.platform_reports
             ],
             "execution_time_seconds": self.execution_time_seconds,
-            "timestamp": self.timestamp
+            "timestamp": self.timestamp_iso
         }
 
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Plain dict of the fields, one level deep: nested dataclasses are left for
+        the JSON encoder to expand (through _json_default) as it walks the report
+        """
+        return {
+            "search_request": self.search_request,
+            "platforms_processed": self.platforms_processed,
+            "total_options": self.total_options,
+            "best_deal": self.best_deal,
+            "platform_reports": self.platform_reports,
+            "execution_time_seconds": self.execution_time_seconds,
+            "timestamp": self.timestamp_iso
+        }
+
+    @property
+    def timestamp_iso(self) -> str:
+        """Local-time ISO 8601 timestamp, formatted only when the report is written"""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
 # ==================== Utilities ====================
 
+_RUPEE_PRICE_RE = re.compile(r'₹\s*(\d[\d,]*(?:\.\d+)?)')
+_PRICE_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+_RATING_RE = re.compile(r'\d+(?:\.\d+)?')  # whole number, so "12" or "(120)" fails the 0-5 check
+
+# Errors that retry_async treats as transient (set by _import_playwright)
+_RETRYABLE_EXC: tuple = (asyncio.TimeoutError,)
+
+
+def _import_playwright():
+    """Bind the Playwright names used at runtime (idempotent)"""
+    global async_playwright, PlaywrightError, PlaywrightTimeoutError, _RETRYABLE_EXC
+    from playwright.async_api import (
+        async_playwright,
+        TimeoutError as PlaywrightTimeoutError,
+        Error as PlaywrightError,
+    )
+    _RETRYABLE_EXC = (PlaywrightTimeoutError, PlaywrightError, asyncio.TimeoutError)
+
+
+if __name__ != '__main__':
+    # imported as a library: nothing to skip, bind the names right away
+    _import_playwright()
+
 def retry_async(max_attempts: int = Config.RETRY_ATTEMPTS, backoff: float = Config.RETRY_BACKOFF):
     """Decorator for retrying async functions"""
+    # Capped base wait per attempt, computed once per decorated function
+    backoff_table = tuple(min(Config.RETRY_MAX_WAIT, backoff ** i) for i in range(max_attempts))
+
     def decorator(func):
         async def wrapper(*args, **kwargs):
             last_exception = None
             for attempt in range(max_attempts):
                 try:
                     return await func(*args, **kwargs)
-                except (PlaywrightTimeoutError, PlaywrightError, asyncio.TimeoutError) as e:
+                except _RETRYABLE_EXC as e:
                     last_exception = e
+                    # Aborted requests (e.g. blocked resources) and a closed browser
+                    # fail the same way every time
+                    if "net::ERR_ABORTED" in str(e) or is_browser_closed_error(e):
+                        logger.error(f"{func.__name__} failed with a non-retryable error: {e}")
+                        break
                     if attempt < max_attempts - 1:
-                        wait_time = backoff ** attempt
+                        # Jitter decorrelates concurrent retries against the same platform
+                        wait_time = backoff_table[attempt] * (0.5 + random.random())
                         logger.warning(
                             f"{func.__name__} attempt {attempt + 1}/{max_attempts} failed: {e}. "
                             f"Retrying in {wait_time:.1f}s..."
@@ -195,6 +332,87 @@ def retry_async(max_attempts: int = Config.RETRY_ATTEMPTS, backoff: float = Conf
         return wrapper
     return decorator
 
+def _private_cache_dir() -> Optional[Path]:
+    """
+    Config.CACHE_DIR, created with mode 0700. None (caching off) if it is not
+    owned by the current user or other users can write to it, since the caches
+    are unpickled on read. Checked once per configured path, not per cache access.
+    """
+    return _resolve_private_dir(Config.CACHE_DIR)
+
+@functools.lru_cache(maxsize=None)
+def _resolve_private_dir(configured: str) -> Optional[Path]:
+    path = Path(os.path.expanduser(configured))
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = path.stat()
+    except OSError as e:
+        logger.debug(f"Cache directory {path} unavailable: {e}")
+        return None
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        logger.warning(f"Not using cache directory {path}: it must be owned by you with mode 0700")
+        return None
+    return path
+
+async def _filter_route(route):
+    """Route handler that drops media, fonts and analytics and lets the rest through"""
+    request = route.request
+    if (request.resource_type in Config.BLOCKED_RESOURCE_TYPES
+            or any(marker in request.url for marker in Config.BLOCKED_URL_MARKERS)):
+        await route.abort()
+    else:
+        await route.continue_()
+
+def _is_cart_write_response(response) -> bool:
+    """expect_response predicate: a non-GET cart request, i.e. the cart update after an add click"""
+    return response.request.method != "GET" and "cart" in response.url.lower()
+
+# Keys a cart line item uses for its own name and price (lower-cased); restaurant
+# names, ids, timestamps and order minimums live under other keys
+_CART_LINE_NAME_KEYS = frozenset({"name", "itemname", "item_name", "dishname", "dish_name", "title"})
+_CART_LINE_PRICE_KEYS = frozenset({"price", "finalprice", "final_price", "itemprice", "item_price"})
+
+def _json_objects(node):
+    """Every JSON object nested anywhere in a parsed body"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+async def _response_confirms_item(response, item: ItemResult) -> bool:
+    """
+    True if a successful JSON cart response has a line item whose name field mentions
+    the item and whose price field equals its final price, so the cart page need not
+    be opened. Anything less leaves the decision to verify_cart_contains.
+    """
+    if not response.ok or not item.final_price:
+        return False
+    try:
+        body = await response.body()
+        data = orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
+    except Exception:
+        return False
+    name = item.item_name.lower()
+    prices = {int(item.final_price), round(item.final_price, 2)}
+    for line in _json_objects(data):
+        line_fields = {str(key).lower(): value for key, value in line.items()}
+        if not any(isinstance(line_fields.get(key), str) and name in line_fields[key].lower()
+                   for key in _CART_LINE_NAME_KEYS):
+            continue
+        if any(type(line_fields.get(key)) in (int, float) and line_fields[key] in prices
+               for key in _CART_LINE_PRICE_KEYS):
+            return True
+    return False
+
+def is_browser_closed_error(exc: BaseException) -> bool:
+    """True if the error means the page/context/browser itself went away"""
+    message = str(exc)
+    return isinstance(exc, PlaywrightError) and ("has been closed" in message or "Target closed" in message)
+
 class PageHelper:
     """Helper methods for common page operations"""
 
@@ -203,7 +421,10 @@ class PageHelper:
         """Safely click an element"""
         try:
             await page.click(selector, timeout=timeout)
-            await asyncio.sleep(Config.ACTION_DELAY)
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=1500)
+            except PlaywrightTimeoutError:
+                pass
             return True
         except Exception as e:
             logger.debug(f"Click failed for {selector}: {e}")
@@ -214,31 +435,138 @@ class PageHelper:
         """Safely fill an input field"""
         try:
             await page.fill(selector, text, timeout=timeout)
-            await asyncio.sleep(0.5)
             return True
         except Exception as e:
             logger.debug(f"Fill failed for {selector}: {e}")
             return False
 
     @staticmethod
-    async def extract_price(text: str) -> Optional[float]:
-        """Extract price from text"""
-        try:
-            cleaned = text.replace('₹', '').replace(',', '').strip()
-            numbers = ''.join(ch for ch in cleaned if ch.isdigit() or ch == '.')
-            return float(numbers) if numbers else None
-        except Exception:
-            return None
+    async def page_shows_item(page: Page, item_name: str, price: Optional[float] = None) -> bool:
+        """Check that the page shows the item (and its ₹ price) in one in-page evaluate"""
+        prices = [int(price), round(price, 2)] if price else []
+        return await page.evaluate(_PAGE_SHOWS_ITEM_JS, [item_name, prices])
 
     @staticmethod
-    async def extract_rating(text: str) -> Optional[float]:
+    async def remove_item_rows(page: Page, item_name: str) -> int:
+        """Click the Remove/Delete buttons whose row mentions the item; returns the number clicked"""
+        marked = await page.evaluate(_REMOVE_BUTTONS_JS, [item_name.lower(), _REMOVE_MARK_ATTR])
+        buttons = page.locator(f"[{_REMOVE_MARK_ATTR}]")
+        clicked = 0
+        # last match first, so a removed row cannot shift the indices still to click
+        for index in reversed(range(marked)):
+            try:
+                button = await buttons.nth(index).element_handle()
+                await button.click()
+                clicked += 1
+                # the row goes away once the cart has updated
+                try:
+                    await button.wait_for_element_state("hidden", timeout=2000)
+                except PlaywrightTimeoutError:
+                    pass
+            except Exception:
+                continue
+        return clicked
+
+    @staticmethod
+    def extract_price(text: str) -> Optional[float]:
+        """Extract price from text (the ₹ amount when present, e.g. not the "2" in "2 items ₹250")"""
+        match = _RUPEE_PRICE_RE.search(text)
+        if match:
+            return float(match.group(1).replace(',', ''))
+        match = _PRICE_RE.search(text)
+        return float(match.group().replace(',', '')) if match else None
+
+    @staticmethod
+    def extract_rating(text: str) -> Optional[float]:
         """Extract rating from text"""
-        try:
-            cleaned = ''.join(ch for ch in text if ch.isdigit() or ch == '.')
-            rating = float(cleaned)
-            return rating if 0 <= rating <= 5 else None
-        except Exception:
+        match = _RATING_RE.search(text)
+        if not match:
             return None
+        rating = float(match.group())
+        return rating if 0 <= rating <= 5 else None
+
+# Reads every card's fields in a single round-trip instead of several
+# query_selector/inner_text calls per card, skipping cards the filters reject
+_EXTRACT_CARDS_JS = """
+(cards, {nameSelector, ratingSelector, priceTags, limit, minRating, priceMin, priceMax}) => {
+    const text = el => (el ? el.innerText : null);
+    // same patterns as PageHelper.extract_rating / extract_price
+    const ratingOf = t => {
+        const m = t && t.match(/\\d+(?:\\.\\d+)?/);
+        const r = m ? parseFloat(m[0]) : NaN;
+        return r >= 0 && r <= 5 ? r : null;
+    };
+    const priceOf = t => {
+        const m = t && (t.match(/₹\\s*(\\d[\\d,]*(?:\\.\\d+)?)/) || t.match(/(\\d[\\d,]*(?:\\.\\d+)?)/));
+        return m ? parseFloat(m[1].replace(/,/g, '')) : null;
+    };
+    const seen = new Set();
+    const extracted = [];
+    for (const card of cards) {
+        if (extracted.length >= limit) break;
+        // resolved to an absolute URL in the page; div cards use their first link
+        const href = card.href || (card.querySelector('a[href]') || {}).href || null;
+        if (href) {
+            // an outer card and its inner anchor often match the same restaurant
+            const key = href.split(/[?#]/)[0];
+            if (seen.has(key)) continue;
+            seen.add(key);
+        }
+        // drop cards the request filters reject before they count towards the limit
+        const rating = text(card.querySelector(ratingSelector));
+        const ratingValue = ratingOf(rating);
+        if (ratingValue && minRating != null && ratingValue < minRating) continue;
+        const price = text(Array.from(card.querySelectorAll(priceTags)).find(el => el.textContent.includes('₹')));
+        const priceValue = priceOf(price);
+        if (priceValue && ((priceMin && priceValue < priceMin) || (priceMax && priceValue > priceMax))) continue;
+        extracted.push({
+            // no name element: fall back to the card's first line, in-page
+            name: text(card.querySelector(nameSelector)) || card.innerText.split('\\n')[0],
+            rating: rating,
+            price: price,
+            href: href,
+        });
+    }
+    return extracted;
+}
+"""
+
+# Searches the rendered text inside the page, so only a boolean crosses CDP.
+# Prices are compared as whole ₹ amounts, so ₹25 does not match inside ₹250.
+_PAGE_SHOWS_ITEM_JS = """
+([name, prices]) => {
+    const text = document.body.innerText;
+    const escaped = name.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&');
+    if (!new RegExp(escaped, 'i').test(text)) return false;
+    if (prices.length === 0) return true;
+    for (const m of text.matchAll(/₹\\s*(\\d[\\d,]*(?:\\.\\d+)?)/g)) {
+        if (prices.includes(parseFloat(m[1].replace(/,/g, '')))) return true;
+    }
+    return false;
+}
+"""
+
+# Marks the cart's Remove/Delete controls whose row mentions the item with the
+# given attribute in one round-trip (clearing stale marks); returns how many.
+# Marking the elements themselves keeps the clicks on exactly these controls,
+# whatever else a Playwright selector would match (e.g. inside shadow roots).
+_REMOVE_MARK_ATTR = "data-food-agent-remove"
+_REMOVE_BUTTONS_JS = """
+([name, attr]) => {
+    document.querySelectorAll(`[${attr}]`).forEach(el => el.removeAttribute(attr));
+    let marked = 0;
+    document.querySelectorAll('button, a').forEach(el => {
+        const label = el.tagName === 'BUTTON' ? /remove|delete/i : /remove/i;
+        if (!label.test(el.textContent)) return;
+        const row = el.closest('div');
+        if (row && row.innerText.toLowerCase().includes(name)) {
+            el.setAttribute(attr, '');
+            marked++;
+        }
+    });
+    return marked;
+}
+"""
 
 # ==================== CAP Manager & Mode ====================
 
@@ -254,8 +582,11 @@ class CAPManager:
       - Consistent cart additions (idempotent, verified, rollback on mismatch)
     """
 
-    def __init__(self, page: Page, mode: CAPMode = CAPMode.AVAILABILITY_FIRST):
-        self.page = page
+    def __init__(self, mode: CAPMode = CAPMode.AVAILABILITY_FIRST):
+        self.mode = mode
+
+    def set_mode(self, mode: CAPMode):
+        """Switch the CAP mode between phases (e.g. search, then cart) without a new manager"""
         self.mode = mode
 
     async def parallel_search_handlers(self, handlers: List["BasePlatformHandler"], timeout_per_handler: float = 25.0):
@@ -282,15 +613,27 @@ class CAPManager:
                 handler.report.errors.append(str(e))
                 handler.report.latency_ms = (time.time() - start) * 1000
                 logger.error(f"{handler.__class__.__name__} search error: {e}")
+                if is_browser_closed_error(e):
+                    # the shared browser is gone; fail fast so the other handlers get cancelled
+                    raise
                 return [], handler.report
 
-        tasks = [run_handler(h) for h in handlers]
-        results = await asyncio.gather(*tasks, return_exceptions=False)
+        tasks = [asyncio.ensure_future(run_handler(h)) for h in handlers]
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        pending = [t for t in tasks if not t.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
         all_results = []
         reports = []
-        for res, rep in results:
-            all_results.extend(res)
-            reports.append(rep)
+        for handler, task in zip(handlers, tasks):
+            if task.cancelled():
+                handler.report.available = False
+                handler.report.errors.append("Cancelled: browser closed during search")
+            elif task.exception() is None:
+                all_results.extend(task.result()[0])
+            reports.append(handler.report)
         return all_results, reports
 
     async def add_to_cart_consistent(self, handler: "BasePlatformHandler", item: ItemResult,
@@ -298,7 +641,8 @@ class CAPManager:
         """
         Try to add `item` to platform cart with *consistency-first* guarantees:
         1. Use an idempotency token so repeated attempts don't create duplicates.
-        2. After add, verify server-side cart contents (price and item).
+        2. After add, verify server-side cart contents (price and item), unless the
+           add's cart response already confirmed the item.
         3. If verification fails, attempt rollback (remove item) and optionally retry.
         Returns True if add is verified consistent; False otherwise.
         """
@@ -314,10 +658,13 @@ class CAPManager:
                 if not callable(add_func):
                     raise NotImplementedError(f"{handler.__class__.__name__} does not implement add_item_to_cart")
 
-                await add_func(item, idempotency_token)
+                confirmed = await add_func(item, idempotency_token)
 
                 verify_func = getattr(handler, "verify_cart_contains", None)
-                if not callable(verify_func):
+                if confirmed is True:
+                    # the add click's own cart response named the item; skip the cart page load
+                    verified = True
+                elif not callable(verify_func):
                     logger.debug("No handler.verify_cart_contains(); performing fallback cart verification")
                     verified = await self._fallback_verify(handler, item)
                 else:
@@ -353,33 +700,27 @@ class CAPManager:
         logger.error(f"Failed to add to cart consistently after {max_attempts} attempts: {last_exc}")
         return False
 
+    @staticmethod
+    def _cart_urls_for(handler: "BasePlatformHandler") -> tuple:
+        """Cart page that worked before for this handler, else all candidates"""
+        known = getattr(handler, "_known_cart_url", None)
+        return (known,) if known else getattr(handler, "_cart_urls", ())
+
     async def _fallback_verify(self, handler: "BasePlatformHandler", item: ItemResult) -> bool:
         """
         Minimal DOM-based verification: opens cart page and checks for item name and price.
         This is brittle: platform-specific handlers should override verify_cart_contains.
         """
         try:
-            cart_urls = [
-                f"{getattr(handler, 'BASE_URL', '')}/cart",
-                f"{getattr(handler, 'BASE_URL', '')}/checkout",
-            ]
-            for url in cart_urls:
-                if not url:
-                    continue
+            for url in self._cart_urls_for(handler):
                 try:
-                    await self.page.goto(url, timeout=Config.NAVIGATION_TIMEOUT)
-                    await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
+                    await handler.page.goto(url, timeout=Config.NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
                 except Exception:
                     continue
 
-                page_text = await self.page.content()
-                if item.item_name.lower() in page_text.lower():
-                    if item.final_price:
-                        price_strs = [f"₹{int(item.final_price)}", f"₹{round(item.final_price,2)}"]
-                        if any(s in page_text for s in price_strs):
-                            return True
-                    else:
-                        return True
+                if await PageHelper.page_shows_item(handler.page, item.item_name, item.final_price):
+                    handler._known_cart_url = url
+                    return True
             return False
         except Exception as e:
             logger.debug(f"Fallback verify failed: {e}")
@@ -388,28 +729,15 @@ class CAPManager:
     async def _fallback_remove(self, handler: "BasePlatformHandler", item: ItemResult):
         """Best-effort: navigate to cart and attempt to remove items matching name"""
         try:
-            cart_urls = [
-                f"{getattr(handler, 'BASE_URL', '')}/cart",
-                f"{getattr(handler, 'BASE_URL', '')}/checkout",
-            ]
-            for url in cart_urls:
-                if not url:
-                    continue
+            for url in self._cart_urls_for(handler):
                 try:
-                    await self.page.goto(url, timeout=Config.NAVIGATION_TIMEOUT)
-                    await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
+                    await handler.page.goto(url, timeout=Config.NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
                 except Exception:
                     continue
 
-                remove_buttons = await self.page.query_selector_all("button:has-text('Remove'), button:has-text('Delete'), a:has-text('Remove')")
-                for btn in remove_buttons:
-                    try:
-                        parent_text = await btn.evaluate("el => el.closest('div')?.innerText || ''")
-                        if item.item_name.lower() in (parent_text or "").lower():
-                            await btn.click()
-                            await asyncio.sleep(0.8)
-                    except Exception:
-                        continue
+                if await PageHelper.remove_item_rows(handler.page, item.item_name):
+                    handler._known_cart_url = url
+                    return
         except Exception as e:
             logger.debug(f"Fallback remove failed: {e}")
             return
@@ -419,440 +747,453 @@ class CAPManager:
 class BasePlatformHandler:
     """Base class for platform-specific handlers"""
 
-    def __init__(self, page: Page, search_request: SearchRequest):
-        self.page = page
+    # Cookies the platform sets only for a logged-in session (per subclass)
+    SESSION_COOKIES: frozenset = frozenset()
+
+    # Cart controls; examples — update after inspecting each site's pages
+    ADD_SELECTOR = "button:has-text('Add'), button:has-text('ADD')"
+    DISH_ADD_SELECTOR = "button:has-text('Add'), button:has-text('ADD')"  # after opening a dish
+    REMOVE_SELECTOR = "button:has-text('Remove'), button:has-text('Delete'), a:has-text('Remove')"
+
+    # Login state per BASE_URL, shared by all handler instances for the session
+    _login_cache: Dict[str, bool] = {}
+
+    def __init__(self, context: BrowserContext, search_request: SearchRequest):
+        self.context = context
+        self.page: Optional[Page] = None  # opened in initialize()
+        self._add_locator: Optional[Locator] = None
+        # every tab this handler opened, so a run attached to the daemon closes only its own
+        self.opened_pages: List[Page] = []
+        self._initialized = False
+        # Candidate cart pages for the CAPManager fallbacks; the one that worked is remembered
+        self._cart_urls = (f"{self.BASE_URL}/cart", f"{self.BASE_URL}/checkout")
+        self._known_cart_url: Optional[str] = None
         self.request = search_request
-        self.helper = PageHelper()
         self.report = PlatformReport(platform=self.__class__.__name__, items_found=0, successful_additions=0)
 
     async def initialize(self):
         """Initialize the platform (navigate to home, check login, etc.)"""
         raise NotImplementedError
 
-    async def search_items(self) -> List[ItemResult]:
-        """Main method to search and process items"""
-        raise NotImplementedError
+    async def _settle(self, selector: str):
+        """After a cart-flow navigation, wait (best-effort) for the element the next step needs"""
+        try:
+            if Config.USE_NETWORK_IDLE:
+                await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
+            else:
+                await self.page.wait_for_selector(selector, timeout=Config.DEFAULT_TIMEOUT)
+        except PlaywrightTimeoutError:
+            logger.debug(f"{self.PLATFORM.value} page did not settle on {selector!r}")
 
-    async def cleanup(self):
-        """Cleanup actions (clear cart, return to home, etc.)"""
+    async def _click_add(self, button: Locator, item: ItemResult) -> bool:
+        """
+        Click an add-to-cart button and wait for the cart update it triggers.
+        Returns True if that response already confirms the item is in the cart.
+        """
+        clicked = False
         try:
-            await self.page.goto(self.BASE_URL, timeout=Config.NAVIGATION_TIMEOUT)
-            await asyncio.sleep(1)
-        except Exception as e:
-            logger.debug(f"Cleanup failed: {e}")
+            async with self.page.expect_response(_is_cart_write_response, timeout=Config.CART_RESPONSE_TIMEOUT) as response_info:
+                await button.click()
+                clicked = True
+            response = await response_info.value
+        except PlaywrightTimeoutError:
+            if not clicked:
+                raise
+            logger.debug(f"No cart update response after the {self.__class__.__name__} add click; verification decides")
+            return False
+        return await _response_confirms_item(response, item)
+
+    async def _new_page(self) -> Page:
+        """Open a tab in the shared context and record it in opened_pages"""
+        page = await self.context.new_page()
+        self.opened_pages.append(page)
+        return page
+
+    async def _ensure_page(self) -> Page:
+        """Open this handler's own tab in the shared context on first use"""
+        if self.page is None:
+            self.page = await self._new_page()
+            # built once; a locator re-resolves against whatever page is loaded
+            self._add_locator = self.page.locator(self.ADD_SELECTOR)
+        return self.page
+
+    async def _check_login(self, cookies: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Check (once per session) for the platform's session cookies in the persistent profile"""
+        if self.BASE_URL not in self._login_cache:
+            if cookies is None:
+                try:
+                    cookies = await self.context.cookies(self.BASE_URL)
+                except Exception:
+                    return True
+            logged_in = any(cookie["name"] in self.SESSION_COOKIES for cookie in cookies)
+            self._login_cache[self.BASE_URL] = logged_in
+            if not logged_in:
+                logger.warning(f"Not logged in to {self.PLATFORM.value}. Some features may be limited.")
+        return self._login_cache[self.BASE_URL]
 
-class SwiggyHandler(BasePlatformHandler):
-    """Swiggy-specific implementation"""
+    @retry_async()
+    async def search_items(self) -> List[ItemResult]:
+        """Main method to search and process items (one tab per food item, bounded)"""
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_SEARCHES)
+
+        async def search(food_item: str) -> List[ItemResult]:
+            cached = self._load_cached_results(food_item)
+            if cached is not None:
+                logger.info(f"Using cached {self.PLATFORM.value} results for: {food_item}")
+                self.report.successful_additions += len(cached)
+                return cached
+
+            async with semaphore:
+                page = await self._new_page()
+                try:
+                    results = await self._search_one(food_item, page)
+                finally:
+                    await page.close()
 
-    BASE_URL = "https://www.swiggy.com"
+            self._store_cached_results(food_item, results)
+            return results
 
-    @retry_async()
-    async def initialize(self):
-        """Navigate to Swiggy homepage"""
-        logger.info("Initializing Swiggy...")
-        await self.page.goto(self.BASE_URL, timeout=Config.NAVIGATION_TIMEOUT)
-        await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-        await asyncio.sleep(Config.PAGE_LOAD_WAIT)
+        batches = await asyncio.gather(*(search(item) for item in self.request.food_items))
+        results = [result for batch in batches for result in batch]
+
+        self.report.items_found = len(results)
+        self.report.results = results
+        return results
 
+    def _cache_path(self, food_item: str) -> Optional[Path]:
+        """Cache file for one food item under the current location and filters (None: no cache dir)"""
+        cache_dir = _private_cache_dir()
+        if cache_dir is None:
+            return None
+        req = self.request
+        key = (f"{self.PLATFORM.value}|{food_item.lower()}|{req.location}|{req.min_rating}|"
+               f"{req.price_min}|{req.price_max}|{req.max_results_per_platform}")
+        return cache_dir / "search" / hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _load_cached_results(self, food_item: str) -> Optional[List[ItemResult]]:
+        """Return cached results if they are younger than SEARCH_CACHE_TTL"""
+        if not Config.SEARCH_CACHE_TTL:
+            return None
+        cache_path = self._cache_path(food_item)
+        if cache_path is None:
+            return None
         try:
-            login_button = await self.page.query_selector("text=/login|sign in/i")
-            if login_button:
-                logger.warning("Not logged in to Swiggy. Some features may be limited.")
-        except Exception:
+            if time.time() - cache_path.stat().st_mtime < Config.SEARCH_CACHE_TTL:
+                return pickle.loads(cache_path.read_bytes())
+        except FileNotFoundError:
             pass
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
 
-    @retry_async()
-    async def search_items(self) -> List[ItemResult]:
-        """Search for items on Swiggy"""
-        results = []
+    def _store_cached_results(self, food_item: str, results: List[ItemResult]):
+        """Cache non-empty results (empty ones may come from a transient failure)"""
+        if not Config.SEARCH_CACHE_TTL or not results:
+            return
+        cache_path = self._cache_path(food_item)
+        if cache_path is None:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(pickle.dumps(results))
+        except Exception as e:
+            logger.debug(f"Failed to write cache entry {cache_path}: {e}")
+
+    async def _search_one(self, food_item: str, page: Page) -> List[ItemResult]:
+        """Search a single food item on the given page"""
+        results: List[ItemResult] = []
+        logger.info(f"Searching {self.PLATFORM.value} for: {food_item}")
 
-        for food_item in self.request.food_items:
-            logger.info(f"Searching Swiggy for: {food_item}")
+        try:
+            # Fresh tabs start on about:blank, so go straight to the search URL
+            search_url = f"{self.BASE_URL}/search?q={food_item}"
+            await page.goto(search_url, timeout=Config.NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
 
+            # Proceed as soon as the cards are in the DOM instead of waiting for
+            # the network to go idle (analytics pings keep it busy indefinitely)
+            cards = page.locator(self.CARD_SELECTOR)
             try:
-                # Search for the item
-                search_input = await self.page.query_selector("input[placeholder*='Search'], input[type='text']")
-                if search_input:
-                    try:
-                        await search_input.fill("")
-                        await search_input.fill(food_item)
-                        await self.page.keyboard.press("Enter")
-                        await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-                        await asyncio.sleep(Config.PAGE_LOAD_WAIT)
-                    except Exception:
-                        # fallback to direct search url
-                        search_url = f"{self.BASE_URL}/search?q={food_item}"
-                        await self.page.goto(search_url, timeout=Config.NAVIGATION_TIMEOUT)
-                        await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-                        await asyncio.sleep(Config.PAGE_LOAD_WAIT)
-                else:
-                    search_url = f"{self.BASE_URL}/search?q={food_item}"
-                    await self.page.goto(search_url, timeout=Config.NAVIGATION_TIMEOUT)
-                    await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-                    await asyncio.sleep(Config.PAGE_LOAD_WAIT)
-
-                # Find restaurant/dish cards
-                cards = await self.page.query_selector_all(
-                    "a[href*='/restaurant/'], div[data-testid*='restaurant'], div[class*='RestaurantList']"
-                )
+                await cards.first.wait_for(state="attached", timeout=Config.DEFAULT_TIMEOUT)
+            except PlaywrightTimeoutError:
+                logger.debug(f"No cards appeared on {self.PLATFORM.value} for {food_item}")
 
-                logger.info(f"Found {len(cards)} cards on Swiggy for {food_item}")
+            results = await self._extract_cards(cards, food_item)
+            logger.info(f"Successfully processed {len(results)} items for {food_item}")
 
-                processed = 0
-                for card in cards[: self.request.max_results_per_platform]:
-                    try:
-                        item_result = await self._process_card(card, food_item)
-                        if item_result:
-                            results.append(item_result)
-                            processed += 1
-                    except Exception as e:
-                        logger.debug(f"Failed to process card: {e}")
-                        self.report.errors.append(f"Card processing error: {str(e)}")
+        except Exception as e:
+            if is_browser_closed_error(e):
+                # not a per-item failure: let CAPManager fail the whole run fast
+                raise
+            logger.error(f"Search failed for {food_item} on {self.PLATFORM.value}: {e}")
+            self.report.errors.append(f"Search error for {food_item}: {str(e)}")
 
-                logger.info(f"Successfully processed {processed} items for {food_item}")
+        return results
 
-            except Exception as e:
-                logger.error(f"Search failed for {food_item} on Swiggy: {e}")
-                self.report.errors.append(f"Search error for {food_item}: {str(e)}")
+    async def _extract_cards(self, locator: Locator, food_item: str) -> List[ItemResult]:
+        """Extract all matched cards with one evaluate_all() and build results in Python"""
+        cards = await locator.evaluate_all(_EXTRACT_CARDS_JS, {
+            "nameSelector": self.NAME_SELECTOR,
+            "ratingSelector": self.RATING_SELECTOR,
+            "priceTags": self.PRICE_TAGS,
+            "limit": self.request.max_results_per_platform,
+            "minRating": self.request.min_rating,
+            "priceMin": self.request.price_min,
+            "priceMax": self.request.price_max,
+        })
 
-        self.report.items_found = len(results)
-        self.report.results = results
-        return results
+        logger.info(f"Found {len(cards)} cards on {self.PLATFORM.value} for {food_item}")
 
-    async def _process_card(self, card, food_item: str) -> Optional[ItemResult]:
-        """Process a single restaurant/item card"""
-        try:
-            # Extract basic info
-            text_content = await card.inner_text()
-
-            # Extract name
-            name_elem = await card.query_selector("h3, h4, div[class*='name'], div[class*='title']")
-            name = await name_elem.inner_text() if name_elem else text_content.split('\n')[0]
-
-            # Extract rating
-            rating = None
-            rating_elem = await card.query_selector("div[class*='rating'], span[class*='rating']")
-            if rating_elem:
-                rating_text = await rating_elem.inner_text()
-                rating = await self.helper.extract_rating(rating_text)
-
-            # Check rating filter
-            if rating and rating < self.request.min_rating:
-                return None
+        results = []
+        for card in cards:
+            try:
+                item_result = self._build_result(card, food_item)
+                if item_result:
+                    results.append(item_result)
+            except Exception as e:
+                logger.debug(f"Failed to process card: {e}")
+                self.report.errors.append(f"Card processing error: {str(e)}")
+        return results
 
-            # Extract price
-            price = None
-            price_elem = await card.query_selector("span:has-text('₹'), div:has-text('₹')")
-            if price_elem:
-                price_text = await price_elem.inner_text()
-                price = await self.helper.extract_price(price_text)
-
-            # Check price filter
-            if price:
-                if self.request.price_min and price < self.request.price_min:
-                    return None
-                if self.request.price_max and price > self.request.price_max:
-                    return None
-
-            # Extract URL
-            url = None
-            href = await card.get_attribute("href")
-            if href:
-                url = href if href.startswith("http") else self.BASE_URL + href
-
-            # Create result
-            result = ItemResult(
-                restaurant_name=name.strip(),
-                rating=rating,
-                item_name=food_item,
-                item_price=price,
-                final_price=price,  # Will be updated if coupon applied
-                discount_percentage=0,
-                coupon_applied=None,
-                platform=Platform.SWIGGY.value,
-                url=url
-            )
+    def _build_result(self, card: Dict[str, Any], food_item: str) -> Optional[ItemResult]:
+        """Build an ItemResult from one card's extracted fields, applying the request filters"""
+        name = card.get("name") or ""
 
-            self.report.successful_additions += 1
-            return result
+        # Extract rating
+        rating = None
+        if card.get("rating"):
+            rating = PageHelper.extract_rating(card["rating"])
 
-        except Exception as e:
-            logger.debug(f"Card processing error: {e}")
+        # Check rating filter
+        if rating and rating < self.request.min_rating:
             return None
 
+        # Extract price
+        price = None
+        if card.get("price"):
+            price = PageHelper.extract_price(card["price"])
+
+        # Check price filter
+        if price:
+            if self.request.price_min and price < self.request.price_min:
+                return None
+            if self.request.price_max and price > self.request.price_max:
+                return None
+
+        # URL (already absolute)
+        url = card.get("href")
+
+        result = ItemResult(
+            restaurant_name=name.strip(),
+            rating=rating,
+            item_name=food_item,
+            item_price=price,
+            final_price=price,  # Will be updated if coupon applied
+            discount_percentage=0,
+            coupon_applied=None,
+            platform=self.PLATFORM.value,
+            url=url
+        )
+
+        self.report.successful_additions += 1
+        return result
+
     # ==== Cart operations (best-effort; adjust selectors after testing) ====
-    async def add_item_to_cart(self, item: ItemResult, idempotency_token: str):
+    async def add_item_to_cart(self, item: ItemResult, idempotency_token: str) -> bool:
         """
         Best-effort: open item/restaurant URL and click add-to-cart.
         Use idempotency_token for logging/tracking only.
+        Returns True if the cart update response already confirms the item.
         """
         if not item.url:
-            raise ValueError("No URL for item to add to cart (Swiggy)")
+            raise ValueError(f"No URL for item to add to cart ({self.PLATFORM.value})")
         try:
-            await self.page.goto(item.url, timeout=Config.NAVIGATION_TIMEOUT)
-            await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-            await asyncio.sleep(1)
+            await self.page.goto(item.url, timeout=Config.NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
 
             # Try to find an "Add" button near the item name
-            # These selectors are examples — update after inspecting Swiggy's page
-            add_buttons = await self.page.query_selector_all("button:has-text('Add'), button:has-text('ADD'), button[data-testid*='add']")
-            if not add_buttons:
+            # the menu renders after DOMContentLoaded
+            await self._settle(self.ADD_SELECTOR)
+            add_buttons = self._add_locator
+            found = await add_buttons.count()
+            if not found:
                 dish = await self.page.query_selector(f"text=\"{item.item_name}\"")
                 if dish:
                     try:
                         await dish.click()
-                        await asyncio.sleep(0.6)
+                        await self.page.wait_for_selector(self.DISH_ADD_SELECTOR, timeout=2000)
                     except Exception:
                         pass
-                    add_buttons = await self.page.query_selector_all("button:has-text('Add'), button:has-text('ADD')")
+                    add_buttons = self.page.locator(self.DISH_ADD_SELECTOR)
+                    found = await add_buttons.count()
 
-            if add_buttons:
+            if found:
                 try:
-                    await add_buttons[0].click()
-                    await asyncio.sleep(1)
+                    return await self._click_add(add_buttons.first, item)
                 except Exception as e:
-                    logger.debug(f"Swiggy add button click failed: {e}")
+                    logger.debug(f"{self.PLATFORM.value} add button click failed: {e}")
                     raise
             else:
-                raise RuntimeError("Could not find add-to-cart button on Swiggy page")
+                raise RuntimeError(f"Could not find add-to-cart button on {self.PLATFORM.value} page")
         except Exception as e:
-            logger.debug(f"Swiggy add_item_to_cart exception: {e}")
+            logger.debug(f"{self.PLATFORM.value} add_item_to_cart exception: {e}")
             raise
 
     async def verify_cart_contains(self, item: ItemResult) -> bool:
-        # Try cart URL then fallback DOM checks
+        """Open the cart page and check it shows the item and its price"""
         try:
             cart_url = f"{self.BASE_URL}/cart"
-            await self.page.goto(cart_url, timeout=Config.NAVIGATION_TIMEOUT)
-            await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-            page_text = await self.page.content()
-            if item.item_name.lower() in page_text.lower():
-                if item.final_price:
-                    if f"₹{int(item.final_price)}" in page_text or f"₹{round(item.final_price,2)}" in page_text:
-                        return True
-                else:
-                    return True
-            return False
+            await self.page.goto(cart_url, timeout=Config.NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+            await self._settle(f"text={item.item_name}")
+            return await PageHelper.page_shows_item(self.page, item.item_name, item.final_price)
         except Exception as e:
-            logger.debug(f"Swiggy verify_cart_contains exception: {e}")
+            logger.debug(f"{self.PLATFORM.value} verify_cart_contains exception: {e}")
             return False
 
     async def remove_item_from_cart(self, item: ItemResult):
+        """Rollback: remove the item's rows from the cart page"""
         try:
             cart_url = f"{self.BASE_URL}/cart"
-            await self.page.goto(cart_url, timeout=Config.NAVIGATION_TIMEOUT)
-            await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-            remove_buttons = await self.page.query_selector_all("button:has-text('Remove'), button:has-text('Delete'), a:has-text('Remove')")
-            for btn in remove_buttons:
-                try:
-                    parent_text = await btn.evaluate("el => el.closest('div')?.innerText || ''")
-                    if item.item_name.lower() in (parent_text or "").lower():
-                        await btn.click()
-                        await asyncio.sleep(0.8)
-                except Exception:
-                    continue
+            await self.page.goto(cart_url, timeout=Config.NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+            await self._settle(self.REMOVE_SELECTOR)
+            await PageHelper.remove_item_rows(self.page, item.item_name)
         except Exception as e:
-            logger.debug(f"Swiggy remove_item_from_cart exception: {e}")
+            logger.debug(f"{self.PLATFORM.value} remove_item_from_cart exception: {e}")
             return
 
-class ZomatoHandler(BasePlatformHandler):
-    """Zomato-specific implementation"""
-
-    BASE_URL = "https://www.zomato.com"
+    async def cleanup(self):
+        """Cleanup actions (clear cart, return to home, etc.)"""
+        if self.page is None:
+            return
+        try:
+            await self.page.goto(self.BASE_URL, timeout=Config.NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+        except Exception as e:
+            logger.debug(f"Cleanup failed: {e}")
 
-    @retry_async()
-    async def initialize(self):
-        """Navigate to Zomato homepage"""
-        logger.info("Initializing Zomato...")
-        await self.page.goto(self.BASE_URL, timeout=Config.NAVIGATION_TIMEOUT)
-        await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-        await asyncio.sleep(Config.PAGE_LOAD_WAIT)
+class SwiggyHandler(BasePlatformHandler):
+    """Swiggy-specific implementation"""
 
-        try:
-            login_button = await self.page.query_selector("text=/login|sign in/i")
-            if login_button:
-                logger.warning("Not logged in to Zomato. Some features may be limited.")
-        except Exception:
-            pass
+    PLATFORM = Platform.SWIGGY
+    BASE_URL = "https://www.swiggy.com"
+    CARD_SELECTOR = "a[href*='/restaurant/'], div[data-testid*='restaurant'], div[class*='RestaurantList']"
+    NAME_SELECTOR = "h3, h4, div[class*='name'], div[class*='title']"
+    RATING_SELECTOR = "div[class*='rating'], span[class*='rating']"
+    PRICE_TAGS = "span, div"
+    ADD_SELECTOR = "button:has-text('Add'), button:has-text('ADD'), button[data-testid*='add']"
+    # Session cookie names observed on swiggy.com; adjust if login detection misfires
+    SESSION_COOKIES = frozenset({"_session_tid", "_is_logged_in"})
 
     @retry_async()
-    async def search_items(self) -> List[ItemResult]:
-        """Search for items on Zomato"""
-        results = []
-
-        for food_item in self.request.food_items:
-            logger.info(f"Searching Zomato for: {food_item}")
+    async def initialize(self):
+        """Prepare the Swiggy tab (once per handler)"""
+        if self._initialized:
+            return
+        logger.info("Initializing Swiggy...")
+        await self._ensure_page()
 
-            try:
-                # Search for the item
-                search_input = await self.page.query_selector("input[placeholder*='Search'], input[type='text']")
-                if search_input:
-                    try:
-                        await search_input.fill("")
-                        await search_input.fill(food_item)
-                        await self.page.keyboard.press("Enter")
-                        await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-                        await asyncio.sleep(Config.PAGE_LOAD_WAIT)
-                    except Exception:
-                        search_url = f"{self.BASE_URL}/search?q={food_item}"
-                        await self.page.goto(search_url, timeout=Config.NAVIGATION_TIMEOUT)
-                        await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-                        await asyncio.sleep(Config.PAGE_LOAD_WAIT)
-                else:
-                    search_url = f"{self.BASE_URL}/search?q={food_item}"
-                    await self.page.goto(search_url, timeout=Config.NAVIGATION_TIMEOUT)
-                    await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-                    await asyncio.sleep(Config.PAGE_LOAD_WAIT)
+        # Searches go straight to the search URL; only a cold profile needs the
+        # homepage visit so the site can set its cookies first
+        cookies = await self.context.cookies(self.BASE_URL)
+        if not cookies:
+            await self.page.goto(self.BASE_URL, timeout=Config.NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+            cookies = await self.context.cookies(self.BASE_URL)
 
-                cards = await self.page.query_selector_all(
-                    "a[href*='/restaurant/'], a[href*='/order/'], div[data-testid*='resCard']"
-                )
+        await self._check_login(cookies)
+        self._initialized = True
 
-                logger.info(f"Found {len(cards)} cards on Zomato for {food_item}")
+class ZomatoHandler(BasePlatformHandler):
+    """Zomato-specific implementation"""
 
-                processed = 0
-                for card in cards[: self.request.max_results_per_platform]:
-                    try:
-                        item_result = await self._process_card(card, food_item)
-                        if item_result:
-                            results.append(item_result)
-                            processed += 1
-                    except Exception as e:
-                        logger.debug(f"Failed to process card: {e}")
-                        self.report.errors.append(f"Card processing error: {str(e)}")
+    PLATFORM = Platform.ZOMATO
+    BASE_URL = "https://www.zomato.com"
+    CARD_SELECTOR = "a[href*='/restaurant/'], a[href*='/order/'], div[data-testid*='resCard']"
+    NAME_SELECTOR = "h4, h3, div[class*='name'], p[class*='name']"
+    RATING_SELECTOR = "div[aria-label*='rating'], div[class*='rating']"
+    PRICE_TAGS = "span, p"
+    ADD_SELECTOR = "button:has-text('Add'), button:has-text('ADD'), button:has-text('Add to cart')"
+    # Zomato access-token cookie; adjust if login detection misfires
+    SESSION_COOKIES = frozenset({"zat"})
 
-                logger.info(f"Successfully processed {processed} items for {food_item}")
+    @retry_async()
+    async def initialize(self):
+        """Prepare the Zomato tab (once per handler)"""
+        if self._initialized:
+            return
+        logger.info("Initializing Zomato...")
+        await self._ensure_page()
 
-            except Exception as e:
-                logger.error(f"Search failed for {food_item} on Zomato: {e}")
-                self.report.errors.append(f"Search error for {food_item}: {str(e)}")
+        # Searches go straight to the search URL; only a cold profile needs the
+        # homepage visit so the site can set its cookies first
+        cookies = await self.context.cookies(self.BASE_URL)
+        if not cookies:
+            await self.page.goto(self.BASE_URL, timeout=Config.NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+            cookies = await self.context.cookies(self.BASE_URL)
 
-        self.report.items_found = len(results)
-        self.report.results = results
-        return results
+        await self._check_login(cookies)
+        self._initialized = True
 
-    async def _process_card(self, card, food_item: str) -> Optional[ItemResult]:
-        """Process a single restaurant/item card"""
-        try:
-            text_content = await card.inner_text()
+# ==================== Main Agent ====================
 
-            name_elem = await card.query_selector("h4, h3, div[class*='name'], p[class*='name']")
-            name = await name_elem.inner_text() if name_elem else text_content.split('\n')[0]
+def _read_daemon_state() -> Optional[Dict[str, Any]]:
+    """State written by a running --daemon, or None"""
+    try:
+        with open(os.path.expanduser(Config.DAEMON_STATE_FILE), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
 
-            rating = None
-            rating_elem = await card.query_selector("div[aria-label*='rating'], div[class*='rating']")
-            if rating_elem:
-                rating_text = await rating_elem.inner_text()
-                rating = await self.helper.extract_rating(rating_text)
 
-            if rating and rating < self.request.min_rating:
-                return None
+def _write_daemon_state(state: Dict[str, Any]):
+    # readable by you only: the endpoint drives the logged-in browser
+    path = Path(os.path.expanduser(Config.DAEMON_STATE_FILE))
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, 'w', encoding='utf-8') as f:
+        os.chmod(path, 0o600)  # an existing file keeps its old mode on open
+        json.dump(state, f)
 
-            price = None
-            price_elem = await card.query_selector("span:has-text('₹'), p:has-text('₹')")
-            if price_elem:
-                price_text = await price_elem.inner_text()
-                price = await self.helper.extract_price(price_text)
-
-            if price:
-                if self.request.price_min and price < self.request.price_min:
-                    return None
-                if self.request.price_max and price > self.request.price_max:
-                    return None
-
-            url = None
-            href = await card.get_attribute("href")
-            if href:
-                url = href if href.startswith("http") else self.BASE_URL + href
-
-            result = ItemResult(
-                restaurant_name=name.strip(),
-                rating=rating,
-                item_name=food_item,
-                item_price=price,
-                final_price=price,
-                discount_percentage=0,
-                coupon_applied=None,
-                platform=Platform.ZOMATO.value,
-                url=url
-            )
 
-            self.report.successful_additions += 1
-            return result
+def _clear_daemon_state():
+    try:
+        os.remove(os.path.expanduser(Config.DAEMON_STATE_FILE))
+    except FileNotFoundError:
+        pass
 
-        except Exception as e:
-            logger.debug(f"Card processing error: {e}")
-            return None
 
-    # ==== Cart operations (best-effort; adjust selectors after testing) ====
-    async def add_item_to_cart(self, item: ItemResult, idempotency_token: str):
-        if not item.url:
-            raise ValueError("No URL for item to add to cart (Zomato)")
+async def _read_devtools_port(port_file: Path, timeout: float) -> Optional[int]:
+    """Port Chromium chose for --remote-debugging-port=0 (first line of DevToolsActivePort)"""
+    deadline = time.monotonic() + timeout / 1000
+    while True:
         try:
-            await self.page.goto(item.url, timeout=Config.NAVIGATION_TIMEOUT)
-            await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-            await asyncio.sleep(1)
-
-            add_buttons = await self.page.query_selector_all("button:has-text('Add'), button:has-text('ADD'), button:has-text('Add to cart')")
-            if not add_buttons:
-                dish = await self.page.query_selector(f"text=\"{item.item_name}\"")
-                if dish:
-                    try:
-                        await dish.click()
-                        await asyncio.sleep(0.6)
-                    except Exception:
-                        pass
-                    add_buttons = await self.page.query_selector_all("button:has-text('Add'), button:has-text('ADD')")
-
-            if add_buttons:
-                try:
-                    await add_buttons[0].click()
-                    await asyncio.sleep(1)
-                except Exception as e:
-                    logger.debug(f"Zomato add button click failed: {e}")
-                    raise
-            else:
-                raise RuntimeError("Could not find add-to-cart button on Zomato page")
-        except Exception as e:
-            logger.debug(f"Zomato add_item_to_cart exception: {e}")
-            raise
+            return int(port_file.read_text(encoding='utf-8').splitlines()[0])
+        except (OSError, ValueError, IndexError):
+            # not written yet (or half-written)
+            if time.monotonic() >= deadline:
+                return None
+        await asyncio.sleep(0.1)
 
-    async def verify_cart_contains(self, item: ItemResult) -> bool:
-        try:
-            cart_url = f"{self.BASE_URL}/cart"
-            await self.page.goto(cart_url, timeout=Config.NAVIGATION_TIMEOUT)
-            await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-            page_text = await self.page.content()
-            if item.item_name.lower() in page_text.lower():
-                if item.final_price:
-                    if f"₹{int(item.final_price)}" in page_text or f"₹{round(item.final_price,2)}" in page_text:
-                        return True
-                else:
-                    return True
-            return False
-        except Exception as e:
-            logger.debug(f"Zomato verify_cart_contains exception: {e}")
-            return False
 
-    async def remove_item_from_cart(self, item: ItemResult):
+async def stop_daemon() -> bool:
+    """Close the --daemon browser (which ends the daemon process); False if none was running"""
+    state = _read_daemon_state()
+    if state is None:
+        logger.info("No browser daemon is running")
+        return False
+    endpoint = state.get("cdp_endpoint")
+    async with async_playwright() as playwright:
         try:
-            cart_url = f"{self.BASE_URL}/cart"
-            await self.page.goto(cart_url, timeout=Config.NAVIGATION_TIMEOUT)
-            await self.page.wait_for_load_state("networkidle", timeout=Config.DEFAULT_TIMEOUT)
-            remove_buttons = await self.page.query_selector_all("button:has-text('Remove'), button:has-text('Delete'), a:has-text('Remove')")
-            for btn in remove_buttons:
-                try:
-                    parent_text = await btn.evaluate("el => el.closest('div')?.innerText || ''")
-                    if item.item_name.lower() in (parent_text or "").lower():
-                        await btn.click()
-                        await asyncio.sleep(0.8)
-                except Exception:
-                    continue
+            browser = await playwright.chromium.connect_over_cdp(endpoint, timeout=Config.DEFAULT_TIMEOUT)
         except Exception as e:
-            logger.debug(f"Zomato remove_item_from_cart exception: {e}")
-            return
+            logger.warning(f"Browser daemon at {endpoint} not reachable ({e}); clearing its state")
+        else:
+            session = await browser.new_browser_cdp_session()
+            try:
+                await session.send("Browser.close")
+            except Exception:
+                pass  # the connection drops as the browser exits
+            logger.info("Browser daemon stopped")
+    _clear_daemon_state()
+    return True
 
-# ==================== Main Agent ====================
 
 class FoodDeliveryAgent:
     """Main orchestrator for food delivery comparison"""
@@ -861,8 +1202,11 @@ class FoodDeliveryAgent:
         self.headless = headless
         self.slow_mo = slow_mo
         self.context: Optional[BrowserContext] = None
-        self.page: Optional[Page] = None
         self.playwright = None
+        self._init_task: Optional[asyncio.Future] = None
+        # set when attached to a --daemon browser instead of launching one
+        self._daemon_browser = None
+        self._handlers: List[BasePlatformHandler] = []
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -873,13 +1217,19 @@ class FoodDeliveryAgent:
         """Async context manager exit"""
         await self.cleanup()
 
+    def prewarm(self):
+        """Start launching the browser in the background; initialize() picks it up"""
+        if self._init_task is None:
+            self._init_task = asyncio.ensure_future(self._launch())
+
     async def initialize(self):
         """Initialize browser and page"""
-        logger.info("Initializing browser (persistent profile)...")
-        self.playwright = await async_playwright().start()
+        self.prewarm()
+        await self._init_task
 
-        # persistent profile to reuse logged-in sessions
-        self.context = await self.playwright.chromium.launch_persistent_context(
+    async def _launch_persistent_context(self, *extra_args: str) -> BrowserContext:
+        """Launch Chromium on the persistent profile to reuse logged-in sessions"""
+        return await self.playwright.chromium.launch_persistent_context(
             user_data_dir=Config.USER_DATA_DIR,
             headless=self.headless,
             slow_mo=self.slow_mo,
@@ -888,25 +1238,115 @@ class FoodDeliveryAgent:
                 "--disable-blink-features=AutomationControlled",
                 "--no-first-run",
                 "--no-default-browser-check",
+                *extra_args,
             ],
         )
 
-        self.page = await self.context.new_page()
-        self.page.set_default_navigation_timeout(Config.NAVIGATION_TIMEOUT)
-        self.page.set_default_timeout(Config.DEFAULT_TIMEOUT)
+    async def _connect_daemon(self) -> bool:
+        """Attach to a running --daemon browser over CDP; False if there is none"""
+        state = _read_daemon_state()
+        if state is None:
+            return False
+        endpoint = state.get("cdp_endpoint")
+        try:
+            self._daemon_browser = await self.playwright.chromium.connect_over_cdp(
+                endpoint, timeout=Config.DEFAULT_TIMEOUT
+            )
+        except Exception as e:
+            logger.warning(f"Browser daemon at {endpoint} not reachable ({e}); launching a browser instead")
+            return False
+        # the daemon's persistent (logged-in) context; cleanup closes only this run's tabs
+        self.context = self._daemon_browser.contexts[0]
+        return True
+
+    async def _launch(self):
+        """Attach to the browser daemon if one is running, else launch the persistent profile"""
+        self.playwright = await async_playwright().start()
+        if await self._connect_daemon():
+            logger.info("Connected to the running browser daemon")
+        else:
+            logger.info("Initializing browser (persistent profile)...")
+            self.context = await self._launch_persistent_context()
+
+        # defaults set on the context apply to every page opened from it
+        self.context.set_default_navigation_timeout(Config.NAVIGATION_TIMEOUT)
+        self.context.set_default_timeout(Config.DEFAULT_TIMEOUT)
+
+        # skip images, media, fonts and trackers for every page in the context
+        # (by resource type, so extension-less CDN image URLs are caught too)
+        await self.context.route("**/*", _filter_route)
 
         logger.info("Browser initialized successfully")
 
     async def cleanup(self):
         """Cleanup browser resources"""
         logger.info("Cleaning up browser...")
-        try:
-            if self.context:
+        if self._init_task is not None and not self._init_task.done():
+            # let a background launch finish so its browser can be closed below
+            await asyncio.gather(self._init_task, return_exceptions=True)
+        # each step on its own, so one failure cannot leave the rest undone
+        if self._daemon_browser is not None:
+            # the daemon's browser (and other runs' tabs in it) stay; close the tabs
+            # this run's handlers opened, then disconnect
+            for handler in self._handlers:
+                for page in handler.opened_pages:
+                    if page.is_closed():
+                        continue
+                    try:
+                        await page.close()
+                    except Exception as e:
+                        logger.debug(f"Failed to close a {handler.PLATFORM.value} tab: {e}")
+            try:
+                await self._daemon_browser.close()
+            except Exception as e:
+                logger.error(f"Cleanup error (daemon disconnect): {e}")
+        elif self.context:
+            try:
                 await self.context.close()
-            if self.playwright:
+            except Exception as e:
+                logger.error(f"Cleanup error (browser): {e}")
+        if self.playwright:
+            try:
                 await self.playwright.stop()
-        except Exception as e:
-            logger.error(f"Cleanup error: {e}")
+            except Exception as e:
+                logger.error(f"Cleanup error (playwright): {e}")
+
+    async def serve(self) -> bool:
+        """
+        Run the browser as a daemon until it is stopped (--stop-daemon or Ctrl+C).
+        Later CLI runs attach to it over CDP instead of cold-starting Chromium.
+        Returns False if the browser could not be started.
+        """
+        self.playwright = await async_playwright().start()
+        # port 0: Chromium binds a free port on 127.0.0.1 and writes it to the profile
+        port_file = Path(Config.USER_DATA_DIR) / "DevToolsActivePort"
+        port_file.unlink(missing_ok=True)  # left over from an earlier browser
+        try:
+            self.context = await self._launch_persistent_context("--remote-debugging-port=0")
+        except PlaywrightError as e:
+            logger.error(
+                f"Could not start the browser daemon ({str(e).splitlines()[0]}); "
+                f"is a daemon or another browser already using {Config.USER_DATA_DIR}?"
+            )
+            await self.cleanup()
+            return False
+        port = await _read_devtools_port(port_file, Config.DEFAULT_TIMEOUT)
+        if port is None:
+            logger.error(f"Browser daemon started but did not report its DevTools port in {port_file}")
+            await self.cleanup()
+            return False
+        closed = asyncio.Event()
+        self.context.on("close", lambda _: closed.set())
+
+        endpoint = f"http://127.0.0.1:{port}"
+        _write_daemon_state({"pid": os.getpid(), "cdp_endpoint": endpoint})
+        logger.info(f"Browser daemon listening on {endpoint} (stop with --stop-daemon)")
+        try:
+            await closed.wait()
+        finally:
+            _clear_daemon_state()
+            await self.cleanup()
+        return True
 
     async def run(self, search_request: SearchRequest) -> RunReport:
         """Execute the food delivery comparison"""
@@ -914,13 +1354,16 @@ class FoodDeliveryAgent:
 
         logger.info(f"Starting search for: {', '.join(search_request.food_items)}")
 
-        # Create handlers
-        swiggy_handler = SwiggyHandler(self.page, search_request)
-        zomato_handler = ZomatoHandler(self.page, search_request)
+        # Create handlers on the shared persistent (logged-in) context; each opens
+        # its own tab in initialize(), so the platforms navigate concurrently.
+        # The tabs are closed in cleanup().
+        swiggy_handler = SwiggyHandler(self.context, search_request)
+        zomato_handler = ZomatoHandler(self.context, search_request)
         handlers = [swiggy_handler, zomato_handler]
+        self._handlers = handlers
 
         # CAP manager: availability-first for searches
-        cap_mgr = CAPManager(self.page, mode=CAPMode.AVAILABILITY_FIRST)
+        cap_mgr = CAPManager(mode=CAPMode.AVAILABILITY_FIRST)
 
         # Run searches in parallel with per-handler timeout
         all_results, platform_reports = await cap_mgr.parallel_search_handlers(handlers, timeout_per_handler=25.0)
@@ -929,16 +1372,15 @@ class FoodDeliveryAgent:
         # (parallel_search_handlers already returned them)
         reports = platform_reports
 
-        # Calculate discounts
+        # Calculate discounts and find the best deal (lowest final_price) in one pass;
+        # rows without a final price have no discount and cannot win, so skip them
+        best_deal = None
         for result in all_results:
+            if result.final_price is None:
+                continue
             result.calculate_discount()
-
-        # Find best deal (lowest final_price)
-        best_deal = None
-        if all_results:
-            valid_results = [r for r in all_results if r.final_price is not None]
-            if valid_results:
-                best_deal = min(valid_results, key=lambda x: x.final_price)
+            if best_deal is None or result.final_price < best_deal.final_price:
+                best_deal = result
 
         # Consistency-first for cart operations: try to add best deal and verify
         if best_deal:
@@ -953,8 +1395,8 @@ class FoodDeliveryAgent:
                 handler_for_platform = zomato_handler
 
             if handler_for_platform:
-                cap_mgr_cart = CAPManager(self.page, mode=CAPMode.CONSISTENCY_FIRST)
-                added_ok = await cap_mgr_cart.add_to_cart_consistent(handler_for_platform, best_deal, max_attempts=3)
+                cap_mgr.set_mode(CAPMode.CONSISTENCY_FIRST)
+                added_ok = await cap_mgr.add_to_cart_consistent(handler_for_platform, best_deal, max_attempts=3)
                 if not added_ok:
                     logger.warning("Could not add best deal to cart consistently. Marking report accordingly.")
                     # add error to the matching platform report
@@ -980,9 +1422,20 @@ class FoodDeliveryAgent:
 
 # ==================== Output Formatting ====================
 
+def _fmt_price(price: Optional[float]) -> str:
+    return f"₹{price}" if price else "N/A"
+
+
+def _fmt_rating(rating: Optional[float]) -> str:
+    return f"{rating}⭐" if rating else "N/A"
+
+
 def print_report(report: RunReport):
     """Print formatted report"""
     if RICH_AVAILABLE:
+        from rich.console import Console
+        from rich.table import Table
+
         console = Console()
 
         # Summary
@@ -1002,6 +1455,28 @@ def print_report(report: RunReport):
                 console.print(f"  Rating: {report.best_deal.rating}⭐")
             console.print()
 
+        # One pass over the platforms: table rows plus error/availability lines
+        rows = []
+        notes = []
+        for pr in report.platform_reports:
+            rows.extend(
+                (
+                    r.platform,
+                    (r.restaurant_name or "")[:30],
+                    (r.item_name or "")[:30],
+                    _fmt_price(r.final_price),
+                    _fmt_rating(r.rating),
+                )
+                for r in pr.results
+            )
+            errors = pr.errors
+            if errors:
+                notes.append(f"\n[yellow]⚠️  {pr.platform} Errors:[/yellow]")
+                notes.extend(f"  - {error}" for error in errors[:5])  # Show first 5 errors
+            latency = pr.latency_ms
+            if latency:
+                notes.append(f"[grey42]Availability: {'Up' if pr.available else 'Down'} | Latency: {latency:.0f}ms[/grey42]")
+
         # All results table
         if report.total_options > 0:
             table = Table(title="All Options")
@@ -1010,26 +1485,14 @@ def print_report(report: RunReport):
             table.add_column("Item", style="white")
             table.add_column("Price", justify="right", style="green")
             table.add_column("Rating", justify="right")
-
-            for pr in report.platform_reports:
-                for result in pr.results:
-                    table.add_row(
-                        result.platform,
-                        (result.restaurant_name or "")[:30],
-                        (result.item_name or "")[:30],
-                        f"₹{result.final_price}" if result.final_price else "N/A",
-                        f"{result.rating}⭐" if result.rating else "N/A"
-                    )
+            for row in rows:
+                table.add_row(*row)
 
             console.print(table)
 
         # Errors and availability
-        for pr in report.platform_reports:
-            if pr.errors:
-                console.print(f"\n[yellow]⚠️  {pr.platform} Errors:[/yellow]")
-                for error in pr.errors[:5]:  # Show first 5 errors
-                    console.print(f"  - {error}")
-            console.print(f"[grey42]Availability: {'Up' if pr.available else 'Down'} | Latency: {pr.latency_ms:.0f}ms[/grey42]") if pr.latency_ms else None
+        if notes:
+            console.print("\n".join(notes))
     else:
         # Plain text output
         print("\n" + "="*60)
@@ -1056,14 +1519,29 @@ def print_report(report: RunReport):
 
 # ==================== Save Report ====================
 
+def _json_default(obj):
+    """Expand dataclasses one level at a time while the encoder walks the report"""
+    as_dict = getattr(obj, "as_dict", None)
+    if as_dict is not None:
+        return as_dict()
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 def save_report(report: RunReport, output_file: str):
     """Save report to JSON file"""
     try:
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+        # Both encoders expand the dataclasses through their as_dict() methods
+        if ORJSON_AVAILABLE:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(report, default=_json_default,
+                                     option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, default=_json_default, indent=2, ensure_ascii=False)
 
         logger.info(f"Report saved to {output_file}")
     except Exception as e:
@@ -1071,6 +1549,35 @@ def save_report(report: RunReport, output_file: str):
 
 # ==================== CLI Interface ====================
 
+async def run_in_thread(func):
+    """
+    Run a blocking function (e.g. input()) without blocking the event loop.
+    Uses a daemon thread so an interrupted prompt can't keep the process alive.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(setter, value):
+        if not future.done():
+            setter(value)
+
+    def target():
+        try:
+            result = func()
+        except BaseException as e:
+            loop.call_soon_threadsafe(resolve, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(resolve, future.set_result, result)
+
+    threading.Thread(target=target, daemon=True).start()
+    return await future
+
+def _read_num(prompt: str, default, cast):
+    """Prompt for a number; an empty answer gives the default"""
+    raw = input(prompt).strip()
+    return cast(raw) if raw else default
+
+
 def interactive_mode() -> SearchRequest:
     """Interactive CLI for user input"""
     print("\n" + "="*60)
@@ -1081,26 +1588,24 @@ def interactive_mode() -> SearchRequest:
     print("\nEnter food items (comma-separated):")
     print("Example: pizza, burger, biryani")
     items_input = input("> ").strip()
-    food_items = [item.strip() for item in items_input.split(",") if item.strip()]
+    food_items = list(filter(None, map(str.strip, items_input.split(","))))
 
     if not food_items:
         print("No food items provided. Exiting.")
         sys.exit(1)
 
     # Rating filter
-    rating_input = input(f"\nMinimum rating (default {Config.MIN_RATING}): ").strip()
-    min_rating = float(rating_input) if rating_input else Config.MIN_RATING
+    min_rating = _read_num(f"\nMinimum rating (default {Config.MIN_RATING}): ", Config.MIN_RATING, float)
 
     # Price filters
-    price_min_input = input("\nMinimum price (leave empty for no limit): ").strip()
-    price_min = float(price_min_input) if price_min_input else None
-
-    price_max_input = input("Maximum price (leave empty for no limit): ").strip()
-    price_max = float(price_max_input) if price_max_input else None
+    price_min = _read_num("\nMinimum price (leave empty for no limit): ", None, float)
+    price_max = _read_num("Maximum price (leave empty for no limit): ", None, float)
 
     # Max results
-    max_results_input = input(f"\nMax results per platform (default {Config.MAX_RESULTS_PER_PLATFORM}): ").strip()
-    max_results = int(max_results_input) if max_results_input else Config.MAX_RESULTS_PER_PLATFORM
+    max_results = _read_num(
+        f"\nMax results per platform (default {Config.MAX_RESULTS_PER_PLATFORM}): ",
+        Config.MAX_RESULTS_PER_PLATFORM, int,
+    )
 
     # Location
     location_input = input("\nLocation (optional, e.g., 'Bangalore', 'Delhi'): ").strip()
@@ -1115,32 +1620,65 @@ def interactive_mode() -> SearchRequest:
         location=location
     )
 
+# Top-level config keys read by load_config_file
+_CONFIG_KEYS = frozenset({
+    'food_items', 'min_rating', 'price_min', 'price_max', 'max_results_per_platform', 'location',
+})
+
+
+def _build_search_request(d: Dict[str, Any]) -> SearchRequest:
+    """Build a SearchRequest from a dict keyed like the config file"""
+    return SearchRequest(
+        food_items=d.get('food_items', []),
+        min_rating=d.get('min_rating', Config.MIN_RATING),
+        price_min=d.get('price_min'),
+        price_max=d.get('price_max'),
+        max_results_per_platform=d.get('max_results_per_platform', Config.MAX_RESULTS_PER_PLATFORM),
+        location=d.get('location')
+    )
+
+
+class ConfigError(Exception):
+    """Config file could not be read or does not describe a valid search"""
+
+
 def load_config_file(config_path: str) -> SearchRequest:
-    """Load search request from JSON config file"""
+    """Load search request from JSON config file (raises ConfigError)"""
+    # One stat up front: rejects missing paths and directories, and sizes the read
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        return SearchRequest(
-            food_items=data.get('food_items', []),
-            min_rating=data.get('min_rating', Config.MIN_RATING),
-            price_min=data.get('price_min'),
-            price_max=data.get('price_max'),
-            max_results_per_platform=data.get('max_results_per_platform', Config.MAX_RESULTS_PER_PLATFORM),
-            location=data.get('location')
-        )
-    except Exception as e:
-        logger.error(f"Failed to load config file: {e}")
-        sys.exit(1)
+        st = os.stat(config_path)
+    except OSError as e:
+        raise ConfigError(f"{e.strerror}: {config_path}") from None
+    if not stat.S_ISREG(st.st_mode):
+        raise ConfigError(f"Not a regular file: {config_path}")
+
+    try:
+        with open(config_path, 'rb', buffering=Config.CONFIG_READ_BUFFER) as f:
+            if IJSON_AVAILABLE and st.st_size > Config.CONFIG_STREAM_THRESHOLD:
+                # Large file: stream the top-level pairs and keep only the keys we use
+                try:
+                    data = {key: value for key, value in ijson.kvitems(f, '', use_float=True)
+                            if key in _CONFIG_KEYS}
+                except ijson.JSONError as e:
+                    raise ConfigError(str(e)) from e
+            else:
+                # One large buffered read; both parsers accept bytes, which skips the text-decoding layer
+                raw = f.read()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        if not isinstance(data, dict):
+            raise ConfigError("expected a JSON object at the top level")
+        food_items = data.get('food_items', [])
+        if not isinstance(food_items, list) or not all(isinstance(item, str) for item in food_items):
+            raise ConfigError("'food_items' must be a list of strings")
+
+        return _build_search_request(data)
+    except (OSError, ValueError) as e:
+        # json.JSONDecodeError and orjson.JSONDecodeError are both ValueErrors
+        raise ConfigError(str(e)) from e
 
 # ==================== Main ====================
 
-async def main():
-    """Main entry point"""
-    parser = argparse.ArgumentParser(
-        description="Food Delivery Comparison Agent - Compare deals across Swiggy and Zomato",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 Examples:
   Interactive mode:
     python food_delivery_agent_CAP.py --interactive
@@ -1153,7 +1691,129 @@ Examples:
 
   With output file:
     python food_delivery_agent_CAP.py --interactive --output results.json
-        """
+
+  Keep the browser running between searches:
+    python food_delivery_agent_CAP.py --daemon &
+    python food_delivery_agent_CAP.py --items "pizza"
+    python food_delivery_agent_CAP.py --stop-daemon
+"""
+
+def _arg_error(message: str) -> Exception:
+    """Build an argparse.ArgumentTypeError without importing argparse up front"""
+    import argparse
+    return argparse.ArgumentTypeError(message)
+
+
+def _rating_arg(value: str) -> float:
+    """argparse type: rating between 0 and 5"""
+    try:
+        rating = float(value)
+    except ValueError:
+        raise _arg_error(f"invalid rating: {value!r}") from None
+    if not 0 <= rating <= 5:
+        raise _arg_error(f"rating must be between 0 and 5, got {value}")
+    return rating
+
+
+def _price_arg(value: str) -> float:
+    """argparse type: non-negative price"""
+    try:
+        price = float(value)
+    except ValueError:
+        raise _arg_error(f"invalid price: {value!r}") from None
+    if not price >= 0:  # also rejects nan
+        raise _arg_error(f"price must be a non-negative number, got {value}")
+    return price
+
+
+def _positive_int(value: str) -> int:
+    """argparse type: integer greater than zero"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise _arg_error(f"invalid integer: {value!r}") from None
+    if number <= 0:
+        raise _arg_error(f"must be a positive integer, got {value}")
+    return number
+
+
+# Flag -> (dest, type); a type of None marks a boolean switch
+_CLI_OPTIONS = {
+    '--interactive': ('interactive', None),
+    '-i': ('interactive', None),
+    '--config': ('config', str),
+    '-c': ('config', str),
+    '--items': ('items', str),
+    '--daemon': ('daemon', None),
+    '--stop-daemon': ('stop_daemon', None),
+    '--rating': ('rating', _rating_arg),
+    '--price-min': ('price_min', _price_arg),
+    '--price-max': ('price_max', _price_arg),
+    '--max-results': ('max_results', _positive_int),
+    '--location': ('location', str),
+    '--headless': ('headless', None),
+    '--headed': ('headless', None),
+    '--slow-mo': ('slow_mo', int),
+    '--output': ('output', str),
+    '-o': ('output', str),
+    '--verbose': ('verbose', None),
+    '-v': ('verbose', None),
+}
+
+
+def _fast_parse_args(argv: List[str]) -> Optional[SimpleNamespace]:
+    """Parse the common invocations without argparse.
+
+    Returns None for anything it does not handle (--help, unknown or
+    abbreviated flags, bad values, a wrong input mode) so the caller can
+    fall back to argparse for the proper message.
+    """
+    args = SimpleNamespace(
+        interactive=False, config=None, items=None, daemon=False, stop_daemon=False,
+        rating=Config.MIN_RATING, price_min=None, price_max=None,
+        max_results=Config.MAX_RESULTS_PER_PLATFORM, location=None,
+        headless=Config.HEADLESS, slow_mo=Config.SLOW_MO,
+        output=None, verbose=False,
+    )
+    i = 0
+    while i < len(argv):
+        flag, sep, value = argv[i].partition('=')
+        i += 1
+        option = _CLI_OPTIONS.get(flag)
+        if option is None:
+            return None
+        dest, type_ = option
+        if type_ is None:
+            if sep:
+                return None
+            setattr(args, dest, flag != '--headed')
+            continue
+        if not sep:
+            if i >= len(argv) or argv[i].startswith('-'):
+                return None
+            value = argv[i]
+            i += 1
+        try:
+            setattr(args, dest, type_(value))
+        except Exception:
+            # Bad value (ArgumentTypeError); argparse reports it properly
+            return None
+
+    # Exactly one input mode, as the argparse group requires
+    modes = (args.interactive, args.config is not None, args.items is not None, args.daemon, args.stop_daemon)
+    if modes.count(True) != 1:
+        return None
+    return args
+
+
+def _build_arg_parser():
+    """Build the full argparse parser (only used for --help and errors)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Food Delivery Comparison Agent - Compare deals across Swiggy and Zomato",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG
     )
 
     # Input modes
@@ -1164,22 +1824,28 @@ Examples:
                             help='Path to JSON config file')
     input_group.add_argument('--items', type=str,
                             help='Comma-separated food items (e.g., "pizza,burger")')
+    input_group.add_argument('--daemon', action='store_true',
+                            help='Keep a browser running for later runs to attach to (until --stop-daemon)')
+    input_group.add_argument('--stop-daemon', action='store_true',
+                            help='Stop the browser started with --daemon')
 
     # Optional parameters (for --items mode)
-    parser.add_argument('--rating', type=float, default=Config.MIN_RATING,
+    parser.add_argument('--rating', type=_rating_arg, default=Config.MIN_RATING,
                        help=f'Minimum rating (default: {Config.MIN_RATING})')
-    parser.add_argument('--price-min', type=float,
+    parser.add_argument('--price-min', type=_price_arg,
                        help='Minimum price filter')
-    parser.add_argument('--price-max', type=float,
+    parser.add_argument('--price-max', type=_price_arg,
                        help='Maximum price filter')
-    parser.add_argument('--max-results', type=int, default=Config.MAX_RESULTS_PER_PLATFORM,
+    parser.add_argument('--max-results', type=_positive_int, default=Config.MAX_RESULTS_PER_PLATFORM,
                        help=f'Max results per platform (default: {Config.MAX_RESULTS_PER_PLATFORM})')
     parser.add_argument('--location', type=str,
                        help='Location (e.g., "Bangalore")')
 
     # Browser options
-    parser.add_argument('--headless', action='store_true',
-                       help='Run browser in headless mode')
+    parser.add_argument('--headless', action='store_true', default=Config.HEADLESS,
+                       help=f'Run browser in headless mode (default: {Config.HEADLESS})')
+    parser.add_argument('--headed', dest='headless', action='store_false',
+                       help='Show the browser window (e.g. to log in the first time)')
     parser.add_argument('--slow-mo', type=int, default=Config.SLOW_MO,
                        help=f'Slow motion delay in ms (default: {Config.SLOW_MO})')
 
@@ -1189,31 +1855,67 @@ Examples:
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging')
 
-    args = parser.parse_args()
+    return parser
 
+
+def parse_args(argv: Optional[List[str]] = None) -> Any:
+    """Parse command line arguments (before any event loop or browser work)"""
+    if argv is None:
+        argv = sys.argv[1:]
+    args = _fast_parse_args(argv)
+    if args is None:
+        args = _build_arg_parser().parse_args(argv)
+    return args
+
+
+async def main(args: Any):
+    """Main entry point"""
     # Setup logging
-    setup_logging(log_file=Config.LOG_FILE, verbose=args.verbose)
+    setup_logging(verbose=args.verbose)
+
+    if args.stop_daemon:
+        sys.exit(0 if await stop_daemon() else 1)
+
+    agent = FoodDeliveryAgent(headless=args.headless, slow_mo=args.slow_mo)
+
+    if args.daemon:
+        add_file_logging(Config.LOG_FILE)
+        if not await agent.serve():
+            sys.exit(1)
+        return
 
     # Get search request
     if args.interactive:
-        search_request = interactive_mode()
+        # Launch the browser while the user is still typing
+        add_file_logging(Config.LOG_FILE)
+        agent.prewarm()
+        try:
+            search_request = await run_in_thread(interactive_mode)
+        except BaseException:
+            await agent.cleanup()
+            raise
     elif args.config:
-        search_request = load_config_file(args.config)
+        try:
+            search_request = load_config_file(args.config)
+        except ConfigError as e:
+            logger.error(f"Failed to load config file {args.config}: {e}")
+            sys.exit(1)
     else:
         # Quick mode with --items
-        food_items = [item.strip() for item in args.items.split(',') if item.strip()]
-        search_request = SearchRequest(
-            food_items=food_items,
-            min_rating=args.rating,
-            price_min=args.price_min,
-            price_max=args.price_max,
-            max_results_per_platform=args.max_results,
-            location=args.location
-        )
+        food_items = list(filter(None, map(str.strip, args.items.split(','))))
+        search_request = _build_search_request({
+            'food_items': food_items,
+            'min_rating': args.rating,
+            'price_min': args.price_min,
+            'price_max': args.price_max,
+            'max_results_per_platform': args.max_results,
+            'location': args.location,
+        })
 
     # Run agent
+    add_file_logging(Config.LOG_FILE)
     try:
-        async with FoodDeliveryAgent(headless=args.headless, slow_mo=args.slow_mo) as agent:
+        async with agent:
             report = await agent.run(search_request)
 
         # Display results
@@ -1234,8 +1936,14 @@ Examples:
         sys.exit(1)
 
 if __name__ == '__main__':
+    # --help and argument errors exit here, before the event loop starts
+    cli_args = parse_args()
+    _import_playwright()
+    if UVLOOP_AVAILABLE:
+        # libuv-backed loop: cheaper scheduling for the many concurrent Playwright calls
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
-        asyncio.run(main())
+        asyncio.run(main(cli_args))
     except KeyboardInterrupt:
         print("\nExiting...")
         sys.exit(130)